@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class DetourConfig(AppConfig):
+    name = 'django_detour'
+    verbose_name = "Detour"
+
+    def ready(self):
+        # Registers the system checks.
+        from . import checks  # noqa: F401
@@ -0,0 +1,32 @@
+"""
+System checks for django-detour.
+
+Redirects are only loaded by the middleware on the first response that needs
+them, so these checks are what stops a deploy with broken redirect files.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, register
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from .middleware import RedirectFallbackMiddleware
+
+
+@register('django_detour')
+def check_redirects(app_configs, **kwargs):
+    """
+    Loads and validates the redirects of every RedirectFallbackMiddleware
+    listed in ``settings.MIDDLEWARE``.
+    """
+    errors = []
+    for middleware_path in getattr(settings, 'MIDDLEWARE', None) or []:
+        middleware_class = import_string(middleware_path)
+        if not (isinstance(middleware_class, type)
+                and issubclass(middleware_class, RedirectFallbackMiddleware)):
+            continue
+        try:
+            middleware_class(lambda request: None).load_redirects()
+        except (ImproperlyConfigured, ValueError, OSError) as e:
+            errors.append(Error(str(e), obj=middleware_path, id='django_detour.E001'))
+    return errors
@@ -1,36 +1,43 @@
 """This module contains a modified redirect middleware that is compatible with Mezzanine."""
-from __future__ import absolute_import
+from urllib.parse import urlparse
 
-from django.utils import six
 from django.conf import settings
-from django.contrib.sites.shortcuts import get_current_site
 
 from ..middleware import (
     RedirectFallbackMiddleware as PlainRedirectFallbackMiddleware,
-    get_redirect
+    get_redirect,
+    is_current_site,
 )
 
-if six.PY2:
-    from urlparse import urlparse
-else:
-    from urllib.parse import urlparse
-
 class RedirectFallbackMiddleware(PlainRedirectFallbackMiddleware):
     def process_response(self, request, response):
-        is_404 = response.status_code == 404
-        is_my_site = get_current_site(request).domain == request.get_host()
+        status_code = response.status_code
+        if 200 <= status_code < 300 and is_current_site(request):
+            # Successful responses on our Site are never redirected. Other
+            # hosts may still have redirects for pages that exist here.
+            return response
 
         # Mezzanine has a urlpattern for all urls that end in a slash, so
         # CommonMiddleware redirects all 404s. We still need to check for a
         # redirect in this case.
         is_common_redirect = False
-        if settings.APPEND_SLASH and response.status_code == 301:
-            parsed = urlparse(response['Location'])
-            if parsed.path == request.path_info + '/':
-                is_common_redirect = True
+        if status_code == 301 and settings.APPEND_SLASH:
+            location = response.get('Location', '')
+            slashed = request.path_info + '/'
+            if location.startswith('/') and not location.startswith('//'):
+                # Relative Location, as CommonMiddleware generates it. Compare
+                # directly, there's no need to parse it. Protocol-relative and
+                # absolute Locations are parsed below.
+                is_common_redirect = (
+                    location == slashed
+                    or location.startswith(slashed + '?')
+                    or location.startswith(slashed + '#')
+                )
+            else:
+                is_common_redirect = urlparse(location).path == slashed
 
-        if (is_404 or not is_my_site) or is_common_redirect:
+        if status_code == 404 or is_common_redirect or not is_current_site(request):
             path = request.get_full_path()
             full_uri = request.build_absolute_uri()
-            response = get_redirect(self.redirects, path, full_uri) or response
+            response = get_redirect(self.lookup, path, full_uri) or response
         return response
@@ -7,12 +7,18 @@ instead.
 """
 
 import os
+import sys
 
+import csv
+import io
+import itertools
+import threading
 import warnings
 
 from collections import defaultdict
+from functools import lru_cache
+from urllib import parse as urlparse
 
-from django.utils import six
 from django.conf import settings
 from django.http import HttpResponse
 from django.core.exceptions import ImproperlyConfigured
@@ -21,58 +27,126 @@ from django.utils.encoding import iri_to_uri
 from django.utils.deprecation import MiddlewareMixin
 
 
-if six.PY2:
-    import urlparse
-    import unicodecsv as csv
-else:
-    from urllib import parse as urlparse
-    import csv
-
-def get_redirect(redirects, path, full_uri):
-    if full_uri in redirects:
-        redirect = redirects[full_uri]
-    elif iri_to_uri(path) in redirects:
-        redirect = redirects[iri_to_uri(path)]
-    elif path in redirects:
-        redirect = redirects[path]
-    elif settings.APPEND_SLASH and path + '/' in redirects:
-        redirect = redirects[path + '/']
-    else:
+def build_lookup(redirects):
+    """
+    Takes the dictionary of Redirect objects returned by
+    ``preprocess_redirects`` and flattens it into a single lookup table keyed
+    by every form a request URL may take, so that matching a request only
+    costs dictionary lookups.
+    """
+    lookup = {}
+    # Sources as declared in the CSV files take precedence over their
+    # normalized forms.
+    for source, redirect in redirects.items():
+        lookup[source] = redirect
+    for source, redirect in redirects.items():
+        lookup.setdefault(iri_to_uri(source), redirect)
+    # With APPEND_SLASH, a path missing its trailing slash also matches.
+    if settings.APPEND_SLASH:
+        for source, redirect in redirects.items():
+            if source.endswith('/') and not redirect.parsed_source.netloc:
+                lookup.setdefault(source[:-1], redirect)
+                lookup.setdefault(iri_to_uri(source)[:-1], redirect)
+    return lookup
+
+
+def get_redirect(lookup, path, full_uri):
+    redirect = lookup.get(full_uri) or lookup.get(path)
+    if redirect is None:
         return None
 
-    target = redirect.target
-    status_code = redirect.status_code
-    netloc = urlparse.urlparse(full_uri).netloc
-
-    if redirect.domain and redirect.domain != netloc:
+    if redirect.domain and redirect.domain != urlparse.urlparse(full_uri).netloc:
         return None
 
-    response = HttpResponse('', status=status_code)
-    response['Location'] = target or None
+    response = HttpResponse(status=redirect.status_code)
+    if redirect.location:
+        response['Location'] = redirect.location
 
     return response
 
 
+@lru_cache(maxsize=None)
+def parse_target(url):
+    """
+    Memoized ``urlparse`` for redirect targets, as many redirects usually
+    share the same target. Sources are unique, so they're parsed directly.
+    """
+    return urlparse.urlparse(url)
+
+
+def is_current_site(request):
+    """
+    Returns whether the request was made to the current Site. The result is
+    cached on the request since it's needed on every response.
+    """
+    matched = getattr(request, '_detour_site_match', None)
+    if matched is None:
+        matched = get_current_site(request).domain == request.get_host()
+        request._detour_site_match = matched
+    return matched
+
+
+def read_rows(path):
+    """
+    Returns the non-blank rows of a CSV redirect file as sequences of fields.
+
+    Files without any quoting can't have commas or line breaks inside fields,
+    so they are simply split, which is much faster than going through the csv
+    module.
+    """
+    with open(path, 'r', newline='') as csvfile:
+        data = csvfile.read()
+
+    if '"' not in data:
+        # Only \r and \n end a row, as with the csv module (str.splitlines()
+        # would also split on other characters, e.g. \u2028).
+        lines = (line.rstrip('\r\n') for line in io.StringIO(data, newline=''))
+        return [line.split(',') for line in lines if line]
+
+    return [row for row in csv.reader(io.StringIO(data, newline='')) if row]
+
+
 def scrape_redirects(redirect_path):
-    for filename in os.listdir(redirect_path):
-        if filename.endswith('.csv'):
-            path = os.path.join(redirect_path, filename)
-            with open(path, 'r') as csvfile:
-                reader = csv.DictReader(csvfile, fieldnames=['source', 'target', 'status_code', 'domain'])
-                for index, line in enumerate(reader):
-                    yield dict(line, filename=filename, line_number=index)
+    with os.scandir(redirect_path) as entries:
+        for entry in entries:
+            if not (entry.name.endswith('.csv') and entry.is_file()):
+                continue
+            for index, row in enumerate(read_rows(entry.path)):
+                width = len(row)
+                yield {
+                    'source': row[0],
+                    'target': row[1] if width > 1 else None,
+                    'status_code': row[2] if width > 2 else None,
+                    'domain': row[3] if width > 3 else None,
+                    'filename': entry.name,
+                    'line_number': index,
+                }
 
 
 class Redirect(object):
     """
     Encapulates all of the information about a redirect.
     """
+    __slots__ = (
+        'source', 'parsed_source', 'target', 'parsed_target', 'target_paths',
+        'location', 'domain', 'status_code', 'filename', 'line_number', '_errors',
+    )
+
     def __init__(self, source, target, status_code, domain, filename, line_number):
         self.source = source.strip()
         self.parsed_source = urlparse.urlparse(self.source)
         self.target = (target or '').strip()
-        self.parsed_target = urlparse.urlparse(self.target)
-        self.domain = domain
+        self.parsed_target = parse_target(self.target)
+        # The target paths a request may end up at, including the one
+        # CommonMiddleware would redirect to when APPEND_SLASH is set.
+        target_path = self.parsed_target.path
+        if settings.APPEND_SLASH and not target_path.endswith('/'):
+            self.target_paths = (target_path, target_path + '/')
+        else:
+            self.target_paths = (target_path,)
+        self.location = self.target or None
+        # The same domain is usually repeated on many lines, share one string.
+        self.domain = sys.intern(domain) if domain else None
         if target:
             self.status_code = int(status_code or 301)
         else:
@@ -90,7 +164,7 @@ class Redirect(object):
         return self._errors
 
     def is_valid(self):
-        return bool(self.errors)
+        return not self.errors
 
     def add_error(self, field, message):
         if self._errors is None:
@@ -98,7 +172,7 @@ class Redirect(object):
         self._errors[field].append(message)
 
     def validate(self):
-        self._errors = self._errors or {}
+        self._errors = self._errors or defaultdict(list)
         if self.status_code < 300 or self.status_code > 399 and not self.status_code == 410:
             self.add_error(
                 'status_code',
@@ -114,62 +188,68 @@ def preprocess_redirects(lines, raise_errors=True):
     Redirect objects from them, and validates the redirects, returning a
     dictionary of Redirect objects.
     """
-    error_messages = defaultdict(list)
-    warning_messages = defaultdict(list)
+    error_messages = []
+    warning_messages = []
 
     processed_redirects = {}
     for line in lines:
         redirect = Redirect(**line)
         # Runs internal validation on the redirect
-        if not redirect.is_valid():
-            for message in redirect.errors.values():
-                error_messages[redirect.source] = message
+        errors = redirect.errors
+        if errors:
+            for messages in errors.values():
+                error_messages.extend(messages)
 
         # Catch duplicate declaration of source urls.
         if redirect.source in processed_redirects:
-            warning_messages[redirect.source].append(
+            warning_messages.append(
                 "WARNING: {filename}:{line_number} "
                 "-  Duplicate declaration of url"
                 .format(**line)
             )
         processed_redirects[redirect.source] = redirect
 
-    def validate_redirect(redirect, with_slash=False):
+    def validate_redirect(redirect):
         """
-        Finds circular and possible circular redirects.
+        Finds circular and possible circular redirects. Each redirect is
+        reported at most once, even if it loops both with and without an
+        appended slash.
         """
-        to_url = redirect.parsed_target
-        if with_slash and not to_url.path.endswith('/'):
-            to_url = to_url._replace(path=to_url.path + '/')
-
-        if (redirect.target in processed_redirects
-            or redirect.target == redirect.parsed_source.path):
-            error_messages[redirect.source].append(
+        source = redirect.source
+        target = redirect.target
+        parsed_source = redirect.parsed_source
+        if target in processed_redirects or target == parsed_source.path:
+            error_messages.append(
                 'ERROR: {redirect.filename}:{redirect.line_number} '
                 '- Circular redirect: {redirect.source} => {redirect.target}'
                 .format(redirect=redirect)
             )
-        elif (urlparse.urljoin(redirect.source, to_url.path) in processed_redirects
-              and not redirect.status_code == 410):
+            return
+        if redirect.status_code == 410:
+            return
+
+        to_url = redirect.parsed_target
+        for target_path in redirect.target_paths:
+            if urlparse.urljoin(source, target_path) not in processed_redirects:
+                continue
             if not to_url.netloc:
-                error_messages[redirect.source].append(
+                error_messages.append(
                     'ERROR: {redirect.filename}:{redirect.line_number} '
                     '- Circular redirect: {redirect.source} => {redirect.target}'
                     .format(redirect=redirect)
                 )
-            elif to_url.netloc and not redirect.parsed_source.netloc:
-                warning_messages[redirect.source].append(
+            elif not parsed_source.netloc:
+                warning_messages.append(
                     'WARNING: {redirect.filename}:{redirect.line_number}: '
                     '- Possible circular redirect if hosting on domain '
                     '{redirect.parsed_target.netloc}: {redirect.source} => '
                     '{redirect.target}'.format(redirect=redirect)
                 )
+            return
 
     # Check for circular redirects.
-    for source, redirect in processed_redirects.items():
+    for redirect in processed_redirects.values():
         validate_redirect(redirect)
-        if settings.APPEND_SLASH:
-            validate_redirect(redirect, with_slash=True)
 
     # Now that we're done, either raise an exception if an error was raised and
     # we are not just running in validation mode
@@ -177,12 +257,8 @@ def preprocess_redirects(lines, raise_errors=True):
         raise ImproperlyConfigured('There were errors while parsing redirects. '
                                    'Run ./manage.py validate_redirects for error details')
     # Output warnings for all errors and warnings found.
-    # Python 2/3 compatibility requires calling list() on the values.
-    warning_message_list = list(warning_messages.values())
-    error_message_list = list(error_messages.values())
-    for messages in warning_message_list + error_message_list:
-        for message in messages:
-            warnings.warn(message)
+    for message in itertools.chain(warning_messages, error_messages):
+        warnings.warn(message)
 
     return processed_redirects
 
@@ -203,10 +279,48 @@ class RedirectFallbackMiddleware(MiddlewareMixin):
     To issue a 410, leave off target url and status code.
     """
     def __init__(self, *args, **kwargs):
-        raise_errors = kwargs.pop('raise_errors', True)
+        self._raise_errors = kwargs.pop('raise_errors', True)
         super(RedirectFallbackMiddleware, self).__init__(*args, **kwargs)
-        raw_redirects = self.get_redirects()
-        self.redirects = preprocess_redirects(raw_redirects, raise_errors)
+        # Redirects are loaded on first use rather than at startup, so that
+        # large redirect files don't delay workers from serving requests. They
+        # are validated up front by the django_detour system check.
+        self._redirects = None
+        self._lookup = None
+        self._load_error = None
+        self._lock = threading.Lock()
+
+    def load_redirects(self):
+        with self._lock:
+            if self._lookup is not None:
+                return
+            # Invalid redirects stay invalid, so don't redo all of the work
+            # (and fail again) on every response.
+            if self._load_error is not None:
+                raise ImproperlyConfigured(
+                    'Redirects failed to load: {error}'.format(error=self._load_error)
+                ) from self._load_error
+            try:
+                raw_redirects = self.get_redirects()
+                redirects = preprocess_redirects(raw_redirects, self._raise_errors)
+            except ImproperlyConfigured as e:
+                self._load_error = e
+                raise
+            self._redirects = redirects
+            self._lookup = build_lookup(redirects)
+
+    @property
+    def redirects(self):
+        if self._lookup is None:
+            self.load_redirects()
+        return self._redirects
+
+    @property
+    def lookup(self):
+        lookup = self._lookup
+        if lookup is None:
+            self.load_redirects()
+            lookup = self._lookup
+        return lookup
 
     def get_redirects(self):
         # Get redirect directory
@@ -219,11 +333,11 @@ class RedirectFallbackMiddleware(MiddlewareMixin):
         return lines
 
     def process_response(self, request, response):
-        if response.status_code != 404 and get_current_site(request).domain == request.get_host():
+        if response.status_code != 404 and is_current_site(request):
             # No need to check for a redirect for non-404 responses, as long as
             # it's our Site.
             return response
         path = request.get_full_path()
         full_uri = request.build_absolute_uri()
 
-        return get_redirect(self.redirects, path, full_uri) or response
+        return get_redirect(self.lookup, path, full_uri) or response
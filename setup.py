@@ -25,7 +25,9 @@ setup(name='django-detour',
     classifiers=[
         "Environment :: Web Environment",
         "Framework :: Django",
+        "Programming Language :: Python :: 3",
     ],
+    python_requires='>=3.6',
     install_requires=[],
     requires=[],
 )